@@ -1,8 +1,9 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-app = FastAPI(title="ralph-sandbox")
+app = FastAPI(title="ralph-sandbox", default_response_class=ORJSONResponse)
 
 
 @app.get("/health")
-def health_check() -> dict:
-    return {"status": "ok"}
+async def health_check() -> ORJSONResponse:
+    return ORJSONResponse({"status": "ok"})
@@ -1,11 +1,51 @@
 """Shared data models for the ralph-sandbox application."""
 
-from app.models.sandbox import ExecResult, FileEntry, SandboxResources
-from app.models.scm import PullRequestInfo
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.models.llm import ModelProfile
+    from app.models.sandbox import (
+        CloneResult,
+        CloneSpec,
+        ExecResult,
+        FileEntry,
+        SandboxResources,
+    )
+    from app.models.scm import PullRequestInfo
+
+_LAZY = {
+    "CloneResult": "app.models.sandbox",
+    "CloneSpec": "app.models.sandbox",
+    "ExecResult": "app.models.sandbox",
+    "FileEntry": "app.models.sandbox",
+    "ModelProfile": "app.models.llm",
+    "PullRequestInfo": "app.models.scm",
+    "SandboxResources": "app.models.sandbox",
+}
 
 __all__ = [
+    "CloneResult",
+    "CloneSpec",
     "ExecResult",
     "FileEntry",
+    "ModelProfile",
     "PullRequestInfo",
     "SandboxResources",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,14 @@
+"""Data models for LLM interactions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ModelProfile:
+    name: str
+    litellm_model: str
+    max_output_tokens: int
+    temperature: float
+    tags: tuple[str, ...] = ()
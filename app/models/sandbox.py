@@ -3,17 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Literal, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SandboxResources:
     vcpu: int
     memory_gib: int
     disk_gib: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecResult:
     exit_code: int
     stdout: str
@@ -21,9 +21,28 @@ class ExecResult:
     duration_ms: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FileEntry:
     name: str
     is_dir: bool
     size: int
     mod_time: Optional[float]
+
+
+@dataclass(frozen=True, slots=True)
+class CloneSpec:
+    sandbox_id: str
+    url: str
+    path: str
+    branch: Optional[str] = None
+    auth: Optional[dict[str, str]] = None
+    depth: Optional[int] = 1
+    partial: Optional[Literal["blobless", "treeless"]] = None
+    submodules: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class CloneResult:
+    sandbox_id: str
+    path: str
+    error: Optional[str] = None
@@ -1,10 +1,29 @@
 """Provider package for sandbox, SCM, and LLM integrations."""
 
-from app.providers.llm.litellm_client import LiteLLMClient
-from app.providers.sandbox import DaytonaProvider, LocalProvider, SandboxProvider
-from app.providers.scm import GitHubProvider, ScmProvider
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.providers.llm.litellm_client import LiteLLMClient
+    from app.providers.sandbox import DaytonaProvider, LocalProvider, SandboxProvider
+    from app.providers.scm import AsyncGitHubProvider, GitHubProvider, ScmProvider
+
+# Providers are imported on first attribute access so that touching the
+# package does not pull in every integration and its dependencies.
+_LAZY = {
+    "AsyncGitHubProvider": "app.providers.scm",
+    "DaytonaProvider": "app.providers.sandbox",
+    "GitHubProvider": "app.providers.scm",
+    "LiteLLMClient": "app.providers.llm.litellm_client",
+    "LocalProvider": "app.providers.sandbox",
+    "SandboxProvider": "app.providers.sandbox",
+    "ScmProvider": "app.providers.scm",
+}
 
 __all__ = [
+    "AsyncGitHubProvider",
     "DaytonaProvider",
     "GitHubProvider",
     "LiteLLMClient",
@@ -12,3 +31,17 @@ __all__ = [
     "SandboxProvider",
     "ScmProvider",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -1,6 +1,108 @@
-"""LiteLLM client placeholder."""
+"""LiteLLM client wrapper driven by config/models.yaml profiles."""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from app.models.llm import ModelProfile
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[3] / "config" / "models.yaml"
+
+# Parsed profiles keyed by absolute config path; entries are revalidated
+# against the file's (mtime, size) so edits are picked up without a restart.
+_PROFILE_CACHE_MAX = 100
+_PROFILE_CACHE: OrderedDict[str, tuple[float, int, dict[str, ModelProfile]]] = OrderedDict()
+
+
+@functools.lru_cache(maxsize=1)
+def _yaml_module() -> ModuleType:
+    try:
+        return importlib.import_module("yaml")
+    except ImportError as exc:
+        raise RuntimeError("PyYAML is required to load model profiles") from exc
+
+
+@functools.lru_cache(maxsize=1)
+def _litellm_module() -> ModuleType:
+    try:
+        return importlib.import_module("litellm")
+    except ImportError as exc:
+        raise RuntimeError("litellm is required for model completions") from exc
+
+
+def _parse_profiles(path: Path) -> dict[str, ModelProfile]:
+    yaml = _yaml_module()
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with path.open("r", encoding="utf-8") as handle:
+        raw = yaml.load(handle, Loader=loader) or {}
+    profiles: dict[str, ModelProfile] = {}
+    for name, spec in (raw.get("profiles") or {}).items():
+        profiles[name] = ModelProfile(
+            name=name,
+            litellm_model=spec["litellm_model"],
+            max_output_tokens=int(spec.get("max_output_tokens", 2048)),
+            temperature=float(spec.get("temperature", 0.2)),
+            tags=tuple(spec.get("tags") or ()),
+        )
+    return profiles
 
 
 class LiteLLMClient:
-    def __init__(self) -> None:
-        raise NotImplementedError("Implement LiteLLM client wrapper")
+    def __init__(
+        self,
+        config_path: str | Path | None = None,
+        default_profile: str | None = None,
+    ) -> None:
+        self._config_path = Path(config_path or DEFAULT_CONFIG_PATH).resolve()
+        self._profiles = self._load_profiles()
+        self._default_profile = default_profile or os.environ.get(
+            "RALPH_DEFAULT_MODEL_PROFILE", "default-cheap"
+        )
+
+    @property
+    def profiles(self) -> dict[str, ModelProfile]:
+        return dict(self._profiles)
+
+    def get_profile(self, name: str | None = None) -> ModelProfile:
+        profile_name = name or self._default_profile
+        try:
+            return self._profiles[profile_name]
+        except KeyError as exc:
+            raise KeyError(f"Unknown model profile: {profile_name}") from exc
+
+    def completion(
+        self,
+        messages: list[dict[str, str]],
+        profile: str | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        selected = self.get_profile(profile)
+        return _litellm_module().completion(
+            model=selected.litellm_model,
+            messages=messages,
+            max_tokens=selected.max_output_tokens,
+            temperature=selected.temperature,
+            **kwargs,
+        )
+
+    def _load_profiles(self) -> dict[str, ModelProfile]:
+        key = str(self._config_path)
+        st = self._config_path.stat()
+        cached = _PROFILE_CACHE.get(key)
+        if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            _PROFILE_CACHE.move_to_end(key)
+            # Profiles are frozen, so a shallow copy keeps the cache private.
+            return dict(cached[2])
+        profiles = _parse_profiles(self._config_path)
+        _PROFILE_CACHE[key] = (st.st_mtime, st.st_size, profiles)
+        _PROFILE_CACHE.move_to_end(key)
+        while len(_PROFILE_CACHE) > _PROFILE_CACHE_MAX:
+            _PROFILE_CACHE.popitem(last=False)
+        return dict(profiles)
@@ -63,6 +63,17 @@ class SandboxProvider(Protocol):
         path: str,
         branch: str | None = None,
         auth: dict[str, str] | None = None,
+        depth: int | None = 1,
+    ) -> None:
+        ...
+
+    def git_fetch(
+        self,
+        sandbox_id: str,
+        path: str,
+        remote: str = "origin",
+        refspec: str | None = None,
+        auth: dict[str, str] | None = None,
     ) -> None:
         ...
 
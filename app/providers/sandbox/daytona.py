@@ -67,6 +67,17 @@ class DaytonaProvider(SandboxProvider):
         path: str,
         branch: str | None = None,
         auth: dict[str, str] | None = None,
+        depth: int | None = 1,
+    ) -> None:
+        raise NotImplementedError
+
+    def git_fetch(
+        self,
+        sandbox_id: str,
+        path: str,
+        remote: str = "origin",
+        refspec: str | None = None,
+        auth: dict[str, str] | None = None,
     ) -> None:
         raise NotImplementedError
 
@@ -1,16 +1,290 @@
-"""Local sandbox provider placeholder."""
+"""Local sandbox provider backed by subprocesses and per-sandbox directories."""
 
 from __future__ import annotations
 
-from typing import Sequence
+# asyncio, secrets, shutil, subprocess and tempfile are imported inside the
+# methods that use them so importing the provider package stays cheap.
+import functools
+import os
+import re
+import stat
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Literal, Sequence
 
-from app.models.sandbox import ExecResult, FileEntry, SandboxResources
+from app.models.sandbox import (
+    CloneResult,
+    CloneSpec,
+    ExecResult,
+    FileEntry,
+    SandboxResources,
+)
 from app.providers.sandbox.base import SandboxProvider
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+_GIT_ENV_DEFAULTS = {
+    "GIT_AUTHOR_NAME": "ralph",
+    "GIT_AUTHOR_EMAIL": "ralph@localhost",
+    "GIT_COMMITTER_NAME": "ralph",
+    "GIT_COMMITTER_EMAIL": "ralph@localhost",
+    "GIT_TERMINAL_PROMPT": "0",
+    # Abort HTTP transfers that stay below 1 KB/s for a minute instead of hanging.
+    "GIT_HTTP_LOW_SPEED_LIMIT": "1000",
+    "GIT_HTTP_LOW_SPEED_TIME": "60",
+}
+
+
+_SANDBOX_NAME = re.compile(r"[A-Za-z0-9._-]+")
+
+_CLONE_JOBS = 8
+_CLONE_PARALLELISM = 16
+_PARTIAL_CLONE_FILTERS = {
+    "blobless": "--filter=blob:none",
+    "treeless": "--filter=tree:0",
+}
+
+_READ_CHUNK = 1 << 16
+_COPY_CHUNK = 1 << 30
+_KNOWN_DIRS_MAX = 1024
+# How long exec and aexec wait for output pipes to close after killing a
+# timed-out command; children that left its process group may still hold them.
+_KILL_GRACE_S = 1.0
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 1024
+
+# $1 is the commit message and $2 the git executable.
+_COMMIT_SCRIPT = '"$2" add -A && "$2" commit -q -m "$1"'
+
+
+@dataclass
+class _SandboxRecord:
+    root: Path
+    # Resolved once at creation; the sandbox root never moves afterwards.
+    resolved_root: str
+    # resolved_root + os.sep, for string-prefix containment checks.
+    root_prefix: str
+    env: dict[str, str] = field(default_factory=dict)
+    labels: dict[str, str] = field(default_factory=dict)
+    running: bool = True
+    # Base environment merged with ``env``; built on first use.
+    merged_env: dict[str, str] | None = None
+    # Resolved directories already created, so repeated writes into the
+    # same tree skip the makedirs syscalls.
+    known_dirs: set[str] = field(default_factory=set)
+
+
+def _decode(data: bytes | None) -> str:
+    return data.decode("utf-8", "replace") if data else ""
+
+
+@functools.lru_cache(maxsize=None)
+def _executable(name: str) -> str:
+    """Absolute path of a host tool, so spawns skip the PATH search."""
+    import shutil
+
+    return shutil.which(name) or name
+
+
+def _timed_out(stderr: bytes | None, timeout_s: float | None) -> bytes:
+    return (stderr or b"") + f"\nCommand timed out after {timeout_s}s".encode()
+
+
+def _exec_result(
+    exit_code: int, stdout: bytes | None, stderr: bytes | None, start: float
+) -> ExecResult:
+    # The single place durations are measured, whichever way the command ended.
+    return ExecResult(
+        exit_code=exit_code,
+        stdout=_decode(stdout),
+        stderr=_decode(stderr),
+        duration_ms=(time.monotonic_ns() - start) // 1_000_000,
+    )
+
+
+def _read_all(fd: int) -> bytes:
+    # Size the first read from fstat so regular files come back in one call;
+    # keep reading in case the file grew or reports no size (e.g. /proc).
+    size = os.fstat(fd).st_size
+    chunks = [os.read(fd, size or _READ_CHUNK)]
+    while chunks[-1]:
+        chunks.append(os.read(fd, _READ_CHUNK))
+    return chunks[0] if len(chunks) == 2 else b"".join(chunks)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _copy_fd(src: int, dst: int) -> int:
+    # Prefer in-kernel copies; fall back to a read/write loop when the kernel
+    # cannot copy between these descriptors (or lacks the syscalls).
+    copiers = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(lambda: os.copy_file_range(src, dst, _COPY_CHUNK))
+    if hasattr(os, "sendfile"):
+        copiers.append(lambda: os.sendfile(dst, src, None, _COPY_CHUNK))
+    total = 0
+    for copy in copiers:
+        try:
+            while copied := copy():
+                total += copied
+            return total
+        except OSError:
+            if total:
+                raise
+    while chunk := os.read(src, _READ_CHUNK):
+        _write_all(dst, chunk)
+        total += len(chunk)
+    return total
+
+
+def _writev_all(fd: int, chunks: Sequence[bytes]) -> None:
+    if not hasattr(os, "writev"):
+        for chunk in chunks:
+            _write_all(fd, chunk)
+        return
+    views = [memoryview(chunk) for chunk in chunks if chunk]
+    start = 0
+    while start < len(views):
+        written = os.writev(fd, views[start : start + _IOV_MAX])
+        # Skip buffers written in full and trim the one cut off mid-way.
+        while start < len(views) and written >= len(views[start]):
+            written -= len(views[start])
+            start += 1
+        if written:
+            views[start] = views[start][written:]
+
+
+def _remove_tree(path: str | Path) -> None:
+    import shutil
+
+    if os.name == "posix":
+        import subprocess
+
+        # rm(1) walks the tree in C; fall back if it is unavailable.
+        try:
+            subprocess.run(
+                [_executable("rm"), "-rf", "--", os.fspath(path)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+        except OSError:
+            pass
+        if not os.path.lexists(path):
+            return
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _kill_process_group(process: Any) -> None:
+    import signal
+
+    try:
+        if os.name == "posix":
+            # The child leads its own session, so its pid is the group id.
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _drain(stream: Any, sink: bytearray) -> None:
+    while chunk := await stream.read(_READ_CHUNK):
+        sink += chunk
+
+
+async def _pipe_to(sink: bytearray) -> tuple[int, Any, Any]:
+    """Open a pipe draining into ``sink``; return its write fd, read transport and task."""
+    import asyncio
+
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader()
+    transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), open(read_fd, "rb", buffering=0)
+    )
+    return write_fd, transport, asyncio.ensure_future(_drain(reader, sink))
+
+
+def _apply_git_auth(url: str, auth: dict[str, str] | None) -> str:
+    if not auth or not url.startswith("https://"):
+        return url
+    token = auth.get("token")
+    if token:
+        return f"https://{auth.get('username', 'x-access-token')}:{token}@{url[8:]}"
+    if "username" in auth and "password" in auth:
+        return f"https://{auth['username']}:{auth['password']}@{url[8:]}"
+    return url
+
+
+def _read_head(repo: str) -> str | None:
+    # Resolve HEAD through a loose ref without spawning git; None means the
+    # layout is unusual (worktree .git file, packed ref, ...) and the caller
+    # should fall back to `git rev-parse`.
+    git_dir = os.path.join(repo, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "rb") as handle:
+            head = handle.read().strip()
+        if head.startswith(b"ref: "):
+            ref = os.fsdecode(head[5:])
+            if not ref.startswith("refs/") or ".." in ref:
+                return None
+            with open(os.path.join(git_dir, ref), "rb") as handle:
+                head = handle.read().strip()
+        bytes.fromhex(head.decode("ascii"))
+    except (OSError, ValueError):
+        return None
+    return head.decode("ascii") if len(head) in (40, 64) else None
+
+
+def _redact(text: str, auth: dict[str, str] | None) -> str:
+    if not auth:
+        return text
+    for key in ("token", "password"):
+        secret = auth.get(key)
+        if secret:
+            text = text.replace(secret, "***")
+    return text
+
 
 class LocalProvider(SandboxProvider):
-    def __init__(self) -> None:
-        raise NotImplementedError("Implement local subprocess sandbox integration")
+    def __init__(self, root_dir: str | Path | None = None) -> None:
+        if root_dir is None:
+            import tempfile
+
+            self._root_dir = Path(tempfile.mkdtemp(prefix="ralph-sandboxes-"))
+        else:
+            self._root_dir = Path(root_dir)
+            self._root_dir.mkdir(parents=True, exist_ok=True)
+        self._sandboxes: dict[str, _SandboxRecord] = {}
+        self._base_env = self._snapshot_env()
+        self._reaper: ThreadPoolExecutor | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        try:
+            parallelism = int(os.environ.get("RALPH_CLONE_PARALLELISM", _CLONE_PARALLELISM))
+        except ValueError:
+            parallelism = _CLONE_PARALLELISM
+        self._clone_parallelism = max(1, parallelism)
+
+    def close(self) -> None:
+        """Shut down worker threads, waiting for background deletions."""
+        for executor in (self._pool, self._reaper):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._pool = None
+        self._reaper = None
+
+    def refresh_env(self) -> None:
+        """Re-snapshot the host environment used as the base for commands."""
+        self._base_env = self._snapshot_env()
+        # PATH may have changed, so resolve git/sh/rm again on next use.
+        _executable.cache_clear()
+        for record in self._sandboxes.values():
+            record.merged_env = None
 
     def create_sandbox(
         self,
@@ -20,16 +294,48 @@ class LocalProvider(SandboxProvider):
         env: dict[str, str] | None = None,
         labels: dict[str, str] | None = None,
     ) -> str:
-        raise NotImplementedError
+        import secrets
+
+        if not _SANDBOX_NAME.fullmatch(name) or name in (".", ".."):
+            raise ValueError(f"Invalid sandbox name: {name!r}")
+        sandbox_id = f"{name}-{secrets.token_urlsafe(12)}"
+        root = self._root_dir / sandbox_id
+        os.mkdir(root, 0o700)
+        resolved_root = os.path.realpath(root)
+        self._sandboxes[sandbox_id] = _SandboxRecord(
+            root=root,
+            resolved_root=resolved_root,
+            root_prefix=os.path.join(resolved_root, ""),
+            env=dict(env or {}),
+            labels=dict(labels or {}),
+        )
+        return sandbox_id
 
     def delete_sandbox(self, sandbox_id: str) -> None:
-        raise NotImplementedError
+        record = self._sandboxes.pop(sandbox_id, None)
+        if record is None:
+            raise ValueError(f"Unknown sandbox: {sandbox_id}")
+        # Move the tree aside (a single rename) and remove it off the
+        # caller's thread; large clones can take seconds to unlink.
+        trash = self._root_dir / f".trash-{sandbox_id}"
+        try:
+            os.rename(record.root, trash)
+        except OSError:
+            _remove_tree(record.root)
+            return
+        if self._reaper is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._reaper = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sandbox-reaper"
+            )
+        self._reaper.submit(_remove_tree, trash)
 
     def start_sandbox(self, sandbox_id: str) -> None:
-        raise NotImplementedError
+        self._get_record(sandbox_id).running = True
 
     def stop_sandbox(self, sandbox_id: str) -> None:
-        raise NotImplementedError
+        self._get_record(sandbox_id).running = False
 
     def exec(
         self,
@@ -39,10 +345,89 @@ class LocalProvider(SandboxProvider):
         env: dict[str, str] | None = None,
         timeout_s: int | None = None,
     ) -> ExecResult:
-        raise NotImplementedError
+        record = self._get_running_record(sandbox_id)
+        workdir = self._resolve_path(sandbox_id, cwd or ".")
+        return self._run(command, workdir, self._merge_env(record, env), timeout_s)
+
+    async def aexec(
+        self,
+        sandbox_id: str,
+        command: Sequence[str],
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+        timeout_s: int | None = None,
+    ) -> ExecResult:
+        """Event-loop friendly ``exec`` for async callers such as API routes."""
+        import asyncio
+
+        record = self._get_running_record(sandbox_id)
+        workdir = self._resolve_path(sandbox_id, cwd or ".")
+        start = time.monotonic_ns()
+        # Own the read ends so they can be closed even if a stray grandchild
+        # keeps the write ends open; output read before a timeout is kept.
+        stdout, stderr = bytearray(), bytearray()
+        pipes = [await _pipe_to(stdout), await _pipe_to(stderr)]
+        process = None
+        timed_out = False
+        try:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    cwd=workdir,
+                    env=self._merge_env(record, env),
+                    stdout=pipes[0][0],
+                    stderr=pipes[1][0],
+                    start_new_session=True,
+                )
+            finally:
+                for write_fd, _, _ in pipes:
+                    os.close(write_fd)
+            try:
+                await asyncio.wait_for(process.wait(), timeout_s)
+            except asyncio.TimeoutError:
+                timed_out = True
+                _kill_process_group(process)
+                await process.wait()
+            await asyncio.wait(
+                [drain for _, _, drain in pipes], timeout=_KILL_GRACE_S if timed_out else None
+            )
+        except FileNotFoundError as exc:
+            return _exec_result(127, None, str(exc).encode(), start)
+        except BaseException:
+            if process is not None:
+                _kill_process_group(process)
+            raise
+        finally:
+            for _, transport, drain in pipes:
+                drain.cancel()
+                transport.close()
+        if timed_out:
+            return _exec_result(124, bytes(stdout), _timed_out(bytes(stderr), timeout_s), start)
+        return _exec_result(process.returncode, bytes(stdout), bytes(stderr), start)
 
     def read_file(self, sandbox_id: str, path: str) -> bytes:
-        raise NotImplementedError
+        fd = os.open(self._resolve_path(sandbox_id, path), os.O_RDONLY)
+        try:
+            return _read_all(fd)
+        finally:
+            os.close(fd)
+
+    def read_file_to(self, sandbox_id: str, path: str, dst: BinaryIO) -> int:
+        """Copy a file into ``dst`` without materialising it; returns the byte count."""
+        src = os.open(self._resolve_path(sandbox_id, path), os.O_RDONLY)
+        try:
+            try:
+                dst_fd = dst.fileno()
+            except (AttributeError, OSError, ValueError):
+                total = 0
+                while chunk := os.read(src, _READ_CHUNK):
+                    dst.write(chunk)
+                    total += len(chunk)
+                return total
+            dst.flush()
+            return _copy_fd(src, dst_fd)
+        finally:
+            os.close(src)
 
     def write_file(
         self,
@@ -52,13 +437,39 @@ class LocalProvider(SandboxProvider):
         mode: int | None = None,
         append: bool = False,
     ) -> None:
-        raise NotImplementedError
+        self._write(sandbox_id, path, mode, append, _write_all, data)
+
+    def write_file_chunks(
+        self,
+        sandbox_id: str,
+        path: str,
+        chunks: Sequence[bytes],
+        mode: int | None = None,
+        append: bool = False,
+    ) -> None:
+        """Like ``write_file`` but writes ``chunks`` without joining them first."""
+        self._write(sandbox_id, path, mode, append, _writev_all, chunks)
 
     def list_files(self, sandbox_id: str, path: str) -> Sequence[FileEntry]:
-        raise NotImplementedError
+        target = self._resolve_path(sandbox_id, path)
+        # DirEntry caches the dirent type and a single lstat per entry.
+        with os.scandir(target) as listing:
+            return [
+                FileEntry(
+                    name=entry.name,
+                    is_dir=entry.is_dir(follow_symlinks=False),
+                    size=(st := entry.stat(follow_symlinks=False)).st_size,
+                    mod_time=st.st_mtime,
+                )
+                for entry in listing
+            ]
 
     def mkdirs(self, sandbox_id: str, path: str) -> None:
-        raise NotImplementedError
+        # Always hit the filesystem: commands run in the sandbox can delete
+        # directories the known-dirs cache still lists.
+        resolved = self._resolve_path(sandbox_id, path)
+        os.makedirs(resolved, exist_ok=True)
+        self._remember_dir(self._get_record(sandbox_id), resolved)
 
     def git_clone(
         self,
@@ -67,22 +478,140 @@ class LocalProvider(SandboxProvider):
         path: str,
         branch: str | None = None,
         auth: dict[str, str] | None = None,
+        depth: int | None = 1,
+        partial: Literal["blobless", "treeless"] | None = None,
+        submodules: bool = False,
+    ) -> None:
+        record = self._get_record(sandbox_id)
+        target = self._resolve_path(sandbox_id, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        command = [_executable("git"), "clone"]
+        if depth is not None:
+            # Sandboxes are short-lived, so fetch only recent history of one
+            # branch; callers needing more can `git fetch --unshallow`.
+            command += [f"--depth={depth}", "--no-tags", "--single-branch"]
+        if partial is not None:
+            # Partial clones keep the full commit graph (use with depth=None)
+            # and fetch omitted blobs/trees on demand.
+            command.append(_PARTIAL_CLONE_FILTERS[partial])
+        if submodules:
+            # Fetch submodules over parallel connections rather than one by one.
+            command += ["--recurse-submodules", f"--jobs={_CLONE_JOBS}"]
+            if depth is not None:
+                command.append("--shallow-submodules")
+        if branch:
+            command += ["--branch", branch]
+        # "--" keeps a url or path starting with "-" from being read as an option.
+        command += ["--", _apply_git_auth(url, auth), target]
+        env = self._merge_env(record, None)
+        result = self._run(command, record.resolved_root, env, None)
+        if result.exit_code != 0:
+            raise RuntimeError(f"git clone failed: {_redact(result.stderr, auth)}")
+        if auth:
+            # Keep credentials out of the clone's .git/config.
+            self._run_git(sandbox_id, path, ["remote", "set-url", "origin", url], env=env)
+
+    def batch_git_clone(self, specs: Sequence[CloneSpec]) -> list[CloneResult]:
+        """Clone many repos concurrently; one failure does not abort the rest."""
+        if not specs:
+            return []
+        from concurrent.futures import ThreadPoolExecutor
+
+        def clone(spec: CloneSpec) -> CloneResult:
+            try:
+                self.git_clone(
+                    spec.sandbox_id,
+                    spec.url,
+                    spec.path,
+                    branch=spec.branch,
+                    auth=spec.auth,
+                    depth=spec.depth,
+                    partial=spec.partial,
+                    submodules=spec.submodules,
+                )
+            except (RuntimeError, ValueError, OSError) as exc:
+                return CloneResult(spec.sandbox_id, spec.path, str(exc))
+            return CloneResult(spec.sandbox_id, spec.path)
+
+        # Clones are network-bound, so allow more of them in flight than the
+        # CPU-sized pool behind batch_git_status.
+        with ThreadPoolExecutor(
+            max_workers=min(self._clone_parallelism, len(specs)),
+            thread_name_prefix="sandbox-clone",
+        ) as pool:
+            return list(pool.map(clone, specs))
+
+    def git_fetch(
+        self,
+        sandbox_id: str,
+        path: str,
+        remote: str = "origin",
+        refspec: str | None = None,
+        auth: dict[str, str] | None = None,
     ) -> None:
-        raise NotImplementedError
+        env = self._merge_env(self._get_record(sandbox_id), None)
+        command = [_executable("git")]
+        if auth:
+            url = self._run_git(
+                sandbox_id, path, ["remote", "get-url", "--", remote], env=env
+            ).strip()
+            # Rewrite the remote's URL for this invocation only, so the
+            # configured fetch refspecs still apply and nothing is persisted.
+            command += ["-c", f"url.{_apply_git_auth(url, auth)}.insteadOf={url}"]
+        command += ["fetch", "--prune", "--no-tags", "--", remote]
+        if refspec:
+            command.append(refspec)
+        self._run_in_repo(sandbox_id, path, command, "git fetch", auth=auth, env=env)
 
     def git_status(self, sandbox_id: str, path: str) -> str:
-        raise NotImplementedError
+        # The untracked cache is stored in the index, so repeated polls skip
+        # rescanning directories whose mtime has not changed.
+        command = [_executable("git"), "-c", "core.untrackedCache=true", "status", "--porcelain"]
+        return self._run_in_repo(sandbox_id, path, command, "git status")
+
+    def batch_git_status(
+        self, sandbox_ids: Sequence[str], path: str
+    ) -> dict[str, str | Exception]:
+        """Run ``git_status`` for the repo at ``path`` in many sandboxes concurrently.
+
+        A sandbox whose status fails maps to the exception instead of aborting the batch.
+        """
+        pool = self._get_pool()
+        futures = {
+            sandbox_id: pool.submit(self.git_status, sandbox_id, path) for sandbox_id in sandbox_ids
+        }
+        statuses: dict[str, str | Exception] = {}
+        for sandbox_id, future in futures.items():
+            try:
+                statuses[sandbox_id] = future.result()
+            except (RuntimeError, ValueError, OSError) as exc:
+                statuses[sandbox_id] = exc
+        return statuses
 
     def git_diff(self, sandbox_id: str, path: str) -> str:
-        raise NotImplementedError
+        return self._run_git(sandbox_id, path, ["diff", "--no-ext-diff", "--no-color"])
 
     def git_checkout_new_branch(
         self, sandbox_id: str, path: str, branch_name: str
     ) -> None:
-        raise NotImplementedError
+        self._run_git(sandbox_id, path, ["checkout", "-b", branch_name])
 
     def git_commit(self, sandbox_id: str, path: str, message: str) -> str:
-        raise NotImplementedError
+        if os.name != "posix":
+            env = self._merge_env(self._get_record(sandbox_id), None)
+            self._run_git(sandbox_id, path, ["add", "-A"], env=env)
+            self._run_git(sandbox_id, path, ["commit", "-q", "-m", message], env=env)
+        else:
+            # add and commit share a single spawn from Python; the message is
+            # passed as a positional argument so it is never quoted.
+            self._run_in_repo(
+                sandbox_id,
+                path,
+                [_executable("sh"), "-c", _COMMIT_SCRIPT, "sh", message, _executable("git")],
+                "git commit",
+            )
+        head = _read_head(self._resolve_path(sandbox_id, path))
+        return head or self._run_git(sandbox_id, path, ["rev-parse", "HEAD"]).strip()
 
     def git_push(
         self,
@@ -92,7 +621,227 @@ class LocalProvider(SandboxProvider):
         branch: str,
         auth: dict[str, str] | None = None,
     ) -> None:
-        raise NotImplementedError
+        env = self._merge_env(self._get_record(sandbox_id), None)
+        target = remote
+        if auth:
+            remote_url = self._run_git(
+                sandbox_id, path, ["remote", "get-url", "--", remote], env=env
+            ).strip()
+            target = _apply_git_auth(remote_url, auth)
+        self._run_git(sandbox_id, path, ["push", "--", target, branch], auth=auth, env=env)
 
     def get_preview_link(self, sandbox_id: str, port: int) -> str | None:
-        raise NotImplementedError
+        self._get_record(sandbox_id)
+        return f"http://localhost:{port}"
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # git subprocesses release the GIL while they run, so threads give
+        # real overlap for fan-out across sandboxes.
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._pool = ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 4) * 2),
+                thread_name_prefix="sandbox-git",
+            )
+        return self._pool
+
+    def _get_record(self, sandbox_id: str) -> _SandboxRecord:
+        try:
+            return self._sandboxes[sandbox_id]
+        except KeyError:
+            raise ValueError(f"Unknown sandbox: {sandbox_id}") from None
+
+    def _get_running_record(self, sandbox_id: str) -> _SandboxRecord:
+        record = self._get_record(sandbox_id)
+        if not record.running:
+            raise RuntimeError(f"Sandbox is stopped: {sandbox_id}")
+        return record
+
+    def _resolve_path(self, sandbox_id: str, path: str) -> str:
+        # Plain string ops: this runs for every file operation and pathlib
+        # object construction dominates its cost.
+        record = self._get_record(sandbox_id)
+        resolved = os.path.realpath(os.path.join(record.resolved_root, path))
+        if not resolved.startswith(record.root_prefix) and resolved != record.resolved_root:
+            raise ValueError(f"Path escapes sandbox: {path}")
+        return resolved
+
+    @staticmethod
+    def _snapshot_env() -> dict[str, str]:
+        return {**os.environ, **_GIT_ENV_DEFAULTS}
+
+    def _write(
+        self,
+        sandbox_id: str,
+        path: str,
+        mode: int | None,
+        append: bool,
+        writer: Callable[[int, Any], None],
+        payload: Any,
+    ) -> None:
+        record = self._get_record(sandbox_id)
+        target = self._resolve_path(sandbox_id, path)
+        if append:
+            fd = self._open_for_write(record, target, os.O_APPEND, mode)
+            try:
+                writer(fd, payload)
+            finally:
+                os.close(fd)
+            return
+        import secrets
+
+        # Write a sibling temp file and rename it over the target so readers
+        # see the old or the new contents, never a partial write.
+        if mode is None:
+            try:
+                mode = stat.S_IMODE(os.stat(target).st_mode)
+            except FileNotFoundError:
+                pass
+        # Fixed-length name so long (but legal) target names still fit NAME_MAX.
+        tmp = os.path.join(os.path.dirname(target), f".ralph-tmp-{secrets.token_hex(8)}")
+        fd = self._open_for_write(record, tmp, os.O_EXCL, mode)
+        try:
+            try:
+                writer(fd, payload)
+            finally:
+                os.close(fd)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _open_for_write(
+        self, record: _SandboxRecord, target: str, flags: int, mode: int | None
+    ) -> int:
+        parent = os.path.dirname(target)
+        self._ensure_dir(record, parent)
+        flags |= os.O_WRONLY | os.O_CREAT
+        try:
+            fd = os.open(target, flags, 0o666 if mode is None else mode)
+        except FileNotFoundError:
+            # The cached parent was removed behind our back; recreate it once.
+            record.known_dirs.discard(parent)
+            self._ensure_dir(record, parent)
+            fd = os.open(target, flags, 0o666 if mode is None else mode)
+        if mode is None:
+            return fd
+        # New files are created with the requested bits so they are never
+        # briefly wider; fchmod then applies them exactly (umask, existing
+        # files) without a second path lookup.
+        try:
+            os.fchmod(fd, mode)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    @staticmethod
+    def _ensure_dir(record: _SandboxRecord, path: str) -> None:
+        if path in record.known_dirs:
+            return
+        os.makedirs(path, exist_ok=True)
+        LocalProvider._remember_dir(record, path)
+
+    @staticmethod
+    def _remember_dir(record: _SandboxRecord, path: str) -> None:
+        if len(record.known_dirs) >= _KNOWN_DIRS_MAX:
+            record.known_dirs.clear()
+        record.known_dirs.add(path)
+
+    def _merge_env(
+        self, record: _SandboxRecord, env: dict[str, str] | None
+    ) -> dict[str, str]:
+        # Base and per-sandbox environments are cached and never mutated;
+        # only per-call overlays build a new dict.
+        if record.env:
+            if record.merged_env is None:
+                record.merged_env = {**self._base_env, **record.env}
+            sandbox_env = record.merged_env
+        else:
+            sandbox_env = self._base_env
+        return {**sandbox_env, **env} if env else sandbox_env
+
+    def _run(
+        self,
+        command: Sequence[str],
+        cwd: str,
+        env: dict[str, str],
+        timeout_s: int | None,
+    ) -> ExecResult:
+        import subprocess
+
+        start = time.monotonic_ns()
+        try:
+            process = subprocess.Popen(
+                command,
+                cwd=cwd,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+                # Descriptors Python opens are non-inheritable (PEP 446), so
+                # skip the child-side sweep that closes every other fd.
+                close_fds=False,
+            )
+        except FileNotFoundError as exc:
+            return _exec_result(127, None, str(exc).encode(), start)
+        with process:
+            try:
+                stdout, stderr = process.communicate(timeout=timeout_s)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(process)
+                try:
+                    stdout, stderr = process.communicate(timeout=_KILL_GRACE_S)
+                except subprocess.TimeoutExpired:
+                    # An escaped grandchild still holds the pipes open.
+                    stdout, stderr = b"", b""
+                return _exec_result(124, stdout, _timed_out(stderr, timeout_s), start)
+            except BaseException:
+                _kill_process_group(process)
+                raise
+        return _exec_result(process.returncode, stdout, stderr, start)
+
+    def _run_git(
+        self,
+        sandbox_id: str,
+        path: str,
+        args: list[str],
+        auth: dict[str, str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> str:
+        return self._run_in_repo(
+            sandbox_id,
+            path,
+            [_executable("git"), *args],
+            f"git {args[0]}",
+            auth=auth,
+            env=env,
+        )
+
+    def _run_in_repo(
+        self,
+        sandbox_id: str,
+        path: str,
+        command: list[str],
+        description: str,
+        auth: dict[str, str] | None = None,
+        env: dict[str, str] | None = None,
+    ) -> str:
+        """Run ``command`` in the repo at ``path``.
+
+        ``env`` is a fully merged environment from ``_merge_env``; multi-step
+        operations build it once and pass it to every step.
+        """
+        record = self._get_record(sandbox_id)
+        repo = self._resolve_path(sandbox_id, path)
+        if env is None:
+            env = self._merge_env(record, None)
+        result = self._run(command, repo, env, None)
+        if result.exit_code != 0:
+            detail = result.stderr or result.stdout
+            raise RuntimeError(f"{description} failed: {_redact(detail, auth)}")
+        return result.stdout
@@ -1,6 +1,43 @@
 """SCM provider implementations and interfaces."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from app.providers.scm.base import ScmProvider
-from app.providers.scm.github import GitHubProvider
+from app.providers.scm.github import (
+    GitHubApiError,
+    GitHubProvider,
+    RateLimitError,
+    TransientGitHubError,
+)
+
+if TYPE_CHECKING:
+    from app.providers.scm.github_async import AsyncGitHubProvider
+
+# The async provider pulls in asyncio; load it only when asked for.
+_LAZY = {"AsyncGitHubProvider": "app.providers.scm.github_async"}
+
+__all__ = [
+    "AsyncGitHubProvider",
+    "GitHubApiError",
+    "GitHubProvider",
+    "RateLimitError",
+    "ScmProvider",
+    "TransientGitHubError",
+]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["GitHubProvider", "ScmProvider"]
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
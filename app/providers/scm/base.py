@@ -32,7 +32,7 @@ class ScmProvider(Protocol):
     def comment_pr(self, pr_number: int, body: str) -> None:
         ...
 
-    def get_pr_checks(self, pr_number: int) -> str:
+    def get_pr_checks(self, pr_number: int, head_sha: str | None = None) -> str:
         ...
 
     def set_commit_status(
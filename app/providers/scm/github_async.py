@@ -0,0 +1,112 @@
+"""Async GitHub client for fanning out PR calls on one event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TypeVar
+
+from app.models.scm import PullRequestInfo
+from app.providers.scm.github import (
+    BASE_HEADERS,
+    DEFAULT_API_URL,
+    GitHubProviderBase,
+    Steps,
+    new_async_client,
+)
+
+T = TypeVar("T")
+
+
+class AsyncGitHubProvider(GitHubProviderBase):
+    """Async counterpart of ``GitHubProvider`` for event-loop callers.
+
+    The underlying ``httpx.AsyncClient`` is bound to the running loop, so each
+    instance owns one; close it with ``aclose()`` or ``async with``.
+    """
+
+    def __init__(
+        self,
+        repo: str | None = None,
+        token: str | None = None,
+        base_url: str = DEFAULT_API_URL,
+    ) -> None:
+        super().__init__(repo, token, base_url)
+        self._client = new_async_client(self._base_url, BASE_HEADERS)
+
+    async def __aenter__(self) -> AsyncGitHubProvider:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*self._writes_in_flight(), return_exceptions=True)
+        await self._client.aclose()
+
+    async def validate_auth(self) -> None:
+        await self._run(self._validate_auth())
+
+    async def get_repo_default_branch(self, repo: str) -> str:
+        return await self._run(self._default_branch(repo))
+
+    async def open_pr(
+        self,
+        repo: str,
+        head_branch: str,
+        base_branch: str,
+        title: str,
+        body: str,
+        draft: bool = False,
+        labels: list[str] | None = None,
+    ) -> PullRequestInfo:
+        info = await self._run(self._open_pr(repo, head_branch, base_branch, title, body, draft))
+        if labels:
+            labelling = self._add_labels(info.number, labels)
+            self._track_write(asyncio.create_task(self._run(labelling)))
+        return info
+
+    async def update_pr(
+        self, pr_number: int, title: str | None = None, body: str | None = None
+    ) -> None:
+        await self._run(self._update_pr(pr_number, title, body))
+
+    async def comment_pr(self, pr_number: int, body: str) -> None:
+        await self._run(self._comment_pr(pr_number, body))
+
+    async def get_pr_checks(self, pr_number: int, head_sha: str | None = None) -> str:
+        return await self._run(self._pr_checks(pr_number, head_sha))
+
+    async def get_pr_checks_many(self, pr_numbers: list[int]) -> dict[int, str | BaseException]:
+        """Poll several PRs concurrently on this client's connection pool.
+
+        A PR whose poll fails maps to the exception instead of failing the batch.
+        """
+        states = await asyncio.gather(
+            *(self.get_pr_checks(number) for number in pr_numbers), return_exceptions=True
+        )
+        return dict(zip(pr_numbers, states))
+
+    async def set_commit_status(
+        self,
+        sha: str,
+        state: str,
+        description: str,
+        target_url: str | None = None,
+    ) -> None:
+        await self._run(self._set_commit_status(sha, state, description, target_url))
+
+    async def flush(self) -> None:
+        await asyncio.gather(*self._writes_in_flight(), return_exceptions=True)
+        self._raise_write_error()
+
+    async def _run(self, steps: Steps[T]) -> T:
+        try:
+            step = next(steps)
+            while True:
+                if isinstance(step, dict):
+                    step = steps.send(await self._client.request(**step))
+                else:
+                    await asyncio.sleep(step)
+                    step = steps.send(None)
+        except StopIteration as done:
+            return done.value
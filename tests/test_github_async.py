@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from app.providers.scm import github_async  # noqa: E402
+from app.providers.scm.github import GitHubApiError  # noqa: E402
+from app.providers.scm.github_async import AsyncGitHubProvider  # noqa: E402
+from tests.test_github_provider import CHECK_RUNS, PULL_HEAD_CHECKS, FakeGitHub  # noqa: E402
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeGitHub()
+
+    def new_client(base_url, headers):
+        return httpx.AsyncClient(
+            base_url=base_url, headers=headers, transport=httpx.MockTransport(fake)
+        )
+
+    monkeypatch.setattr(github_async, "new_async_client", new_client)
+    monkeypatch.setenv("RALPH_CHECK_TTL", "0")
+    return fake
+
+
+def run(provider, call):
+    async def scenario():
+        async with provider:
+            return await call(provider)
+
+    return asyncio.run(scenario())
+
+
+def test_checks_use_pull_head_ref_and_etags(api):
+    api.add(
+        "GET",
+        PULL_HEAD_CHECKS,
+        httpx.Response(200, json=CHECK_RUNS, headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+    )
+
+    async def poll_twice(provider):
+        return [await provider.get_pr_checks(7), await provider.get_pr_checks(7)]
+
+    assert run(AsyncGitHubProvider("o/r", token="secret"), poll_twice) == ["success", "success"]
+    assert api.paths() == [PULL_HEAD_CHECKS, PULL_HEAD_CHECKS]
+    assert api.requests[0].headers["Authorization"] == "Bearer secret"
+    assert api.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_pull_head_fallback(api):
+    api.add("GET", PULL_HEAD_CHECKS, httpx.Response(422, json={}))
+    api.add("GET", "/repos/o/r/pulls/7", httpx.Response(200, json={"head": {"sha": "abc"}}))
+    api.add("GET", "/repos/o/r/commits/abc/check-runs", httpx.Response(200, json=CHECK_RUNS))
+
+    async def poll_twice(provider):
+        return [await provider.get_pr_checks(7), await provider.get_pr_checks(7)]
+
+    assert run(AsyncGitHubProvider("o/r", token="secret"), poll_twice) == ["success", "success"]
+    assert api.paths() == [
+        PULL_HEAD_CHECKS,
+        "/repos/o/r/pulls/7",
+        "/repos/o/r/commits/abc/check-runs",
+        "/repos/o/r/pulls/7",
+        "/repos/o/r/commits/abc/check-runs",
+    ]
+
+
+def test_rate_limited_requests_are_retried(api):
+    api.add(
+        "GET",
+        "/repos/o/r",
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"default_branch": "main"}),
+    )
+
+    async def default_branch(provider):
+        return await provider.get_repo_default_branch("o/r")
+
+    assert run(AsyncGitHubProvider(token="secret"), default_branch) == "main"
+    assert len(api.requests) == 2
+
+
+def test_open_pr_labels_in_background_and_flush_reports_failures(api):
+    created = {"number": 7, "html_url": "https://github.com/o/r/pull/7", "head": {"sha": "abc"}}
+    api.add("POST", "/repos/o/r/pulls", httpx.Response(201, json=created))
+    api.add("POST", "/repos/o/r/issues/7/labels", httpx.Response(422, json={"message": "bad"}))
+
+    async def open_and_flush(provider):
+        info = await provider.open_pr("o/r", "feature", "main", "Title", "Body", labels=["x"])
+        with pytest.raises(GitHubApiError):
+            await provider.flush()
+        await provider.flush()
+        with pytest.raises(ValueError):
+            await provider.open_pr("other/repo", "feature", "main", "Title", "Body")
+        return info
+
+    info = run(AsyncGitHubProvider(token="secret"), open_and_flush)
+    assert (info.number, info.head_sha) == (7, "abc")
+    assert api.paths() == ["/repos/o/r/pulls", "/repos/o/r/issues/7/labels"]
+
+
+def test_get_pr_checks_many_reports_failures_per_pr(api):
+    for number in (1, 2):
+        path = f"/repos/o/r/commits/pull/{number}/head/check-runs"
+        api.add("GET", path, httpx.Response(200, json=CHECK_RUNS))
+
+    async def poll(provider):
+        return await provider.get_pr_checks_many([1, 2, 3])
+
+    states = run(AsyncGitHubProvider("o/r", token="secret"), poll)
+    assert (states[1], states[2]) == ("success", "success")
+    assert isinstance(states[3], GitHubApiError) and states[3].status_code == 404
@@ -0,0 +1,254 @@
+import email.utils
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from app.providers.scm import github  # noqa: E402
+from app.providers.scm.github import GitHubApiError, GitHubProvider, RateLimitError  # noqa: E402
+
+CHECK_RUNS = {"check_runs": [{"status": "completed", "conclusion": "success"}]}
+PULL_HEAD_CHECKS = "/repos/o/r/commits/pull/7/head/check-runs"
+
+
+class FakeGitHub:
+    """Routes requests to canned responses and records what was sent."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+
+    def add(self, method, path, *responses):
+        self.routes.setdefault((method, path), []).extend(responses)
+
+    def __call__(self, request):
+        self.requests.append(request)
+        responses = self.routes.get((request.method, request.url.path))
+        if not responses:
+            return httpx.Response(404, json={"message": "Not Found"})
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        return response(request) if callable(response) else response
+
+    def paths(self):
+        return [request.url.path for request in self.requests]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeGitHub()
+    client = httpx.Client(
+        base_url=github.DEFAULT_API_URL,
+        headers=github.BASE_HEADERS,
+        transport=httpx.MockTransport(fake),
+    )
+    monkeypatch.setattr(github, "get_client", lambda base_url=github.DEFAULT_API_URL: client)
+    monkeypatch.setenv("RALPH_CHECK_TTL", "0")
+    yield fake
+    client.close()
+
+
+def make_provider(repo="o/r"):
+    return GitHubProvider(repo=repo, token="secret")
+
+
+def test_checks_use_pull_head_ref_in_one_request(api):
+    api.add("GET", PULL_HEAD_CHECKS, httpx.Response(200, json=CHECK_RUNS))
+    provider = make_provider()
+    assert provider.get_pr_checks(7) == "success"
+    assert api.paths() == [PULL_HEAD_CHECKS]
+    assert api.requests[0].headers["Authorization"] == "Bearer secret"
+
+
+def test_etag_304_reuses_cached_body(api):
+    api.add(
+        "GET",
+        PULL_HEAD_CHECKS,
+        httpx.Response(200, json=CHECK_RUNS, headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+    )
+    provider = make_provider()
+    assert provider.get_pr_checks(7) == "success"
+    assert provider.get_pr_checks(7) == "success"
+    assert "If-None-Match" not in api.requests[0].headers
+    assert api.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_pull_head_fallback_disables_ref_only_for_existing_prs(api):
+    api.add("GET", PULL_HEAD_CHECKS, httpx.Response(422, json={}))
+    api.add("GET", "/repos/o/r/pulls/7", httpx.Response(200, json={"head": {"sha": "abc"}}))
+    api.add("GET", "/repos/o/r/commits/abc/check-runs", httpx.Response(200, json=CHECK_RUNS))
+    provider = make_provider()
+
+    with pytest.raises(GitHubApiError) as excinfo:
+        provider.get_pr_checks(99)
+    assert excinfo.value.status_code == 404
+
+    assert provider.get_pr_checks(7) == "success"
+    assert api.paths()[-3:] == [
+        PULL_HEAD_CHECKS,
+        "/repos/o/r/pulls/7",
+        "/repos/o/r/commits/abc/check-runs",
+    ]
+
+    del api.requests[:]
+    assert provider.get_pr_checks(7) == "success"
+    assert api.paths() == ["/repos/o/r/pulls/7", "/repos/o/r/commits/abc/check-runs"]
+
+
+def test_check_runs_follow_total_count_across_pages(api):
+    done = {"status": "completed", "conclusion": "success"}
+    failed = {"status": "completed", "conclusion": "failure"}
+
+    def check_runs(request):
+        page = int(request.url.params.get("page", 1))
+        runs = [done] * 100 if page == 1 else [failed]
+        return httpx.Response(200, json={"total_count": 101, "check_runs": runs})
+
+    api.add("GET", PULL_HEAD_CHECKS, check_runs)
+    assert make_provider().get_pr_checks(7) == "failure"
+    assert [request.url.params.get("page") for request in api.requests] == [None, "2"]
+
+
+def test_head_sha_skips_pr_lookup(api):
+    no_runs = httpx.Response(200, json={"check_runs": []})
+    api.add("GET", "/repos/o/r/commits/abc/check-runs", no_runs)
+    assert make_provider().get_pr_checks(7, head_sha="abc") == "none"
+    assert api.paths() == ["/repos/o/r/commits/abc/check-runs"]
+
+
+def test_rate_limited_requests_are_retried(api):
+    api.add(
+        "GET",
+        "/repos/o/r",
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"default_branch": "main"}),
+    )
+    assert make_provider().get_repo_default_branch("o/r") == "main"
+    assert len(api.requests) == 2
+
+
+def test_rate_limit_error_after_retries(api):
+    api.add("GET", "/repos/o/r", httpx.Response(429, headers={"Retry-After": "0"}))
+    with pytest.raises(RateLimitError) as excinfo:
+        make_provider().get_repo_default_branch("o/r")
+    assert excinfo.value.retry_after == 0.0
+    assert len(api.requests) == github.RATE_LIMIT_RETRIES + 1
+
+
+def test_retry_after_accepts_an_http_date(api):
+    past = email.utils.formatdate(time.time() - 5, usegmt=True)
+    api.add(
+        "GET",
+        "/repos/o/r",
+        httpx.Response(429, headers={"Retry-After": past}),
+        httpx.Response(200, json={"default_branch": "main"}),
+    )
+    assert make_provider().get_repo_default_branch("o/r") == "main"
+    assert len(api.requests) == 2
+
+
+def test_long_rate_limit_waits_raise_instead_of_sleeping(api):
+    api.add("GET", "/repos/o/r", httpx.Response(429, headers={"Retry-After": "3600"}))
+    with pytest.raises(RateLimitError) as excinfo:
+        make_provider().get_repo_default_branch("o/r")
+    assert excinfo.value.retry_after == 3600.0
+    assert len(api.requests) == 1
+
+
+def test_exhausted_quota_fails_fast_until_reset(api):
+    exhausted = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+    branch = httpx.Response(200, json={"default_branch": "main"}, headers=exhausted)
+    api.add("GET", "/repos/o/r", branch)
+    provider = make_provider()
+    assert provider.get_repo_default_branch("o/r") == "main"
+    with pytest.raises(RateLimitError) as excinfo:
+        provider.get_repo_default_branch("other/repo")
+    assert excinfo.value.retry_after > github.MAX_RATE_LIMIT_WAIT
+    assert len(api.requests) == 1
+
+
+def rollup(state):
+    return {"commits": {"nodes": [{"commit": {"statusCheckRollup": {"state": state}}}]}}
+
+
+def test_graphql_fetches_many_prs_in_one_request(api):
+    data = {"data": {"repository": {"pr1": rollup("SUCCESS"), "pr2": rollup("FAILURE")}}}
+    api.add("POST", "/graphql", httpx.Response(200, json=data))
+    assert make_provider().get_pr_checks_graphql([1, 2, 1]) == {1: "success", 2: "failure"}
+    assert api.paths() == ["/graphql"]
+
+
+def test_graphql_falls_back_to_rest_and_remembers_a_missing_endpoint(api):
+    api.add("GET", PULL_HEAD_CHECKS, httpx.Response(200, json=CHECK_RUNS))
+    provider = make_provider()
+    assert provider.get_pr_checks_graphql([7]) == {7: "success"}
+    assert provider.get_pr_checks_graphql([7]) == {7: "success"}
+    assert api.paths() == ["/graphql", PULL_HEAD_CHECKS, PULL_HEAD_CHECKS]
+
+
+def test_graphql_query_errors_fall_back_without_disabling_graphql(api):
+    api.add("POST", "/graphql", httpx.Response(200, json={"errors": [{"message": "nope"}]}))
+    api.add("GET", PULL_HEAD_CHECKS, httpx.Response(200, json=CHECK_RUNS))
+    provider = make_provider()
+    provider.get_pr_checks_graphql([7])
+    provider.get_pr_checks_graphql([7])
+    assert api.paths() == ["/graphql", PULL_HEAD_CHECKS, "/graphql", PULL_HEAD_CHECKS]
+
+
+def test_graphql_rate_limit_is_not_retried_over_rest(api):
+    api.add("POST", "/graphql", httpx.Response(429, headers={"Retry-After": "3600"}))
+    with pytest.raises(RateLimitError):
+        make_provider().get_pr_checks_graphql([7])
+    assert api.paths() == ["/graphql"]
+
+
+def test_check_results_are_cached_for_the_ttl(api, monkeypatch):
+    monkeypatch.setenv("RALPH_CHECK_TTL", "60")
+    api.add("GET", PULL_HEAD_CHECKS, httpx.Response(200, json=CHECK_RUNS))
+    api.add("PATCH", "/repos/o/r/pulls/7", httpx.Response(200, json={}))
+    provider = make_provider()
+    provider.get_pr_checks(7)
+    provider.get_pr_checks(7)
+    assert len(api.requests) == 1
+
+    provider.update_pr(7, title="new title")
+    provider.get_pr_checks(7)
+    assert api.paths()[-1] == PULL_HEAD_CHECKS
+    assert len(api.requests) == 3
+
+
+def test_default_branch_is_cached(api):
+    api.add("GET", "/repos/o/r", httpx.Response(200, json={"default_branch": "main"}))
+    provider = make_provider()
+    assert provider.get_repo_default_branch("o/r") == "main"
+    assert provider.get_repo_default_branch("o/r") == "main"
+    assert len(api.requests) == 1
+    provider.invalidate_repo_cache("o/r")
+    provider.get_repo_default_branch("o/r")
+    assert len(api.requests) == 2
+
+
+def test_open_pr_labels_in_background_and_flush_reports_failures(api):
+    created = {"number": 7, "html_url": "https://github.com/o/r/pull/7", "head": {"sha": "abc"}}
+    api.add("POST", "/repos/o/r/pulls", httpx.Response(201, json=created))
+    api.add("POST", "/repos/o/r/issues/7/labels", httpx.Response(422, json={"message": "bad"}))
+    provider = GitHubProvider(token="secret")
+    info = provider.open_pr("o/r", "feature", "main", "Title", "Body", labels=["ralph"])
+    assert (info.number, info.head_sha) == (7, "abc")
+
+    with pytest.raises(GitHubApiError):
+        provider.flush()
+    provider.flush()
+    provider.close()
+    assert api.paths() == ["/repos/o/r/pulls", "/repos/o/r/issues/7/labels"]
+
+
+def test_open_pr_rejects_a_second_repo(api):
+    created = {"number": 7, "html_url": "https://github.com/o/r/pull/7", "head": {"sha": "abc"}}
+    api.add("POST", "/repos/o/r/pulls", httpx.Response(201, json=created))
+    provider = GitHubProvider(token="secret")
+    provider.open_pr("o/r", "feature", "main", "Title", "Body")
+    with pytest.raises(ValueError):
+        provider.open_pr("other/repo", "feature", "main", "Title", "Body")
+    assert api.paths() == ["/repos/o/r/pulls"]
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from app.providers.llm.litellm_client import LiteLLMClient  # noqa: E402
+
+CONFIG = "profiles:\n  cheap:\n    litellm_model: {model}\n"
+
+
+def write_config(path, model, mtime):
+    path.write_text(CONFIG.format(model=model))
+    os.utime(path, (mtime, mtime))
+
+
+def model_of(path):
+    return LiteLLMClient(path, default_profile="cheap").get_profile().litellm_model
+
+
+def test_profiles_are_cached_until_mtime_or_size_changes(tmp_path):
+    config = tmp_path / "models.yaml"
+    write_config(config, "model-a", 1_000_000)
+    assert model_of(config) == "model-a"
+
+    # Same size and mtime: the cached parse is reused.
+    write_config(config, "model-b", 1_000_000)
+    assert model_of(config) == "model-a"
+
+    write_config(config, "model-b", 1_000_001)
+    assert model_of(config) == "model-b"
+
+    write_config(config, "model-cc", 1_000_001)
+    assert model_of(config) == "model-cc"